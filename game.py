@@ -1,5 +1,8 @@
 import pgzrun
+import array
 import math
+import numpy as np
+import pygame
 from pygame import Rect
 
 # Game constants
@@ -7,28 +10,137 @@ WIDTH = 800
 HEIGHT = 600
 GRAVITY = 0.5  # Defines the vertical acceleration applied to sprites each frame.
 JUMP_STRENGTH = -12  # Initial upward velocity applied during a jump (negative for up).
+MAX_LIVES = 3  # Lives the player starts each level with.
+# Visible area plus a margin, so sprites straddling the screen edge still count
+# as on-screen. Off-screen coins and enemies skip animation and drawing.
+CULL_RECT = Rect(0, 0, WIDTH, HEIGHT).inflate(64, 64)
+# Squared pickup distance between coin and player centers (coin radius 12 plus
+# approximate player hitbox 20), shared by every coin.
+COIN_PICKUP_DIST_SQ = (12 + 20) ** 2
 
 # Game state
 game_state = "menu"  # Current state of the game: "menu", "playing", "gameover", "win".
 music_enabled = True
 sounds_enabled = True
 score = 0
-lives = 3
+lives = MAX_LIVES
 game_over_message = ""  # Text displayed on game over/win screens.
 music_started = False  # Flag to ensure background music is played only once.
 
 # Sprite loading flag (set to True to use image sprites, False for geometric shapes)
 USE_SPRITES = True  # Determines whether to load image files or use simple shapes for rendering.
 
+# Sine lookup table for the procedural (geometric) animations. A non-negative
+# angle in radians maps to SIN_LUT[int(angle * SIN_LUT_SCALE + 0.5) & SIN_LUT_MASK],
+# the nearest table step; adding a quarter turn (SIN_LUT_SIZE // 4 steps) to
+# the index gives the cosine.
+SIN_LUT_SIZE = 256
+SIN_LUT_MASK = SIN_LUT_SIZE - 1
+SIN_LUT_SCALE = SIN_LUT_SIZE / (2 * math.pi)  # Table steps per radian.
+SIN_LUT = array.array("f", [math.sin(i * 2 * math.pi / SIN_LUT_SIZE)
+                            for i in range(SIN_LUT_SIZE)])
+
+# Physics bodies, stored as structure-of-arrays so gravity is applied to every
+# sprite in one vectorized step. Row i belongs to the sprite whose body == i.
+# The arrays start with room for 32 bodies and grow in add_body() when full.
+body_vel = np.zeros((32, 2), dtype=np.float32)  # Per-body [vx, vy].
+body_on_ground = np.zeros(32, dtype=bool)
+body_count = 0  # Number of rows handed out to sprites.
+
+
+def add_body():
+    """Hands out the next row of the body arrays, doubling their size if they are full.
+
+    Returns:
+        int: The new body's row.
+    """
+    global body_vel, body_on_ground, body_count
+    if body_count == len(body_on_ground):
+        body_vel = np.concatenate((body_vel, np.zeros_like(body_vel)))
+        body_on_ground = np.concatenate((body_on_ground, np.zeros_like(body_on_ground)))
+    body_count += 1
+    return body_count - 1
+
+
+def apply_gravity():
+    """Applies gravity to every airborne body in a single vectorized update."""
+    vy = body_vel[:body_count, 1]
+    vy[~body_on_ground[:body_count]] += GRAVITY
+    # Clamp the max falling speed to prevent excessive velocity (terminal velocity).
+    np.minimum(vy, 15, out=vy)
+
+
+def make_frames(surfaces, flip=False):
+    """Pairs each animation frame with its half-size, for blitting centered on a point.
+
+    Args:
+        surfaces (list): The animation's frame Surfaces.
+        flip (bool): If True, the frames are mirrored horizontally first.
+
+    Returns:
+        list: (surface, half_width, half_height) tuples.
+    """
+    if flip:
+        surfaces = [pygame.transform.flip(surf, True, False) for surf in surfaces]
+    return [(surf, surf.get_width() // 2, surf.get_height() // 2) for surf in surfaces]
+
+
+def load_animations(label, animations, mirrored=True):
+    """Loads a sprite type's animations once, to be shared by all its instances.
+
+    Args:
+        label (str): Sprite type named in the load messages (e.g. "Player").
+        animations (dict): Maps each animation name to its list of image names.
+        mirrored (bool): Whether to also build left-facing frames.
+
+    Returns:
+        dict or None: Maps each animation name to a (right_frames, left_frames)
+        pair from make_frames() (left_frames is None unless mirrored), or None
+        if sprites are disabled or an image couldn't be loaded.
+    """
+    if not USE_SPRITES:
+        return None
+    try:
+        loaded = {}
+        for name, image_names in animations.items():
+            # NOTE: 'images' is globally available in Pygame Zero.
+            surfaces = [images.load(image_name) for image_name in image_names]
+            loaded[name] = (make_frames(surfaces),
+                            make_frames(surfaces, flip=True) if mirrored else None)
+    except Exception as e:
+        print(f"{label} sprites not found: {e}")
+        print("Using geometric shapes instead")
+        return None
+    print(f"{label} sprites loaded successfully!")
+    return loaded
+
+
+# Sprite animations, loaded (and flipped) once at startup.
+PLAYER_ANIMATIONS = load_animations("Player", {
+    "idle": [f"player/idle/idle__{i:03d}" for i in range(10)],
+    "walk": [f"player/walk/run__{i:03d}" for i in range(10)],
+    "jump": [f"player/jump/jump__{i:03d}" for i in range(10)],
+})
+ENEMY_ANIMATIONS = load_animations("Enemy", {
+    "walk": [f"enemies/walk_{i}" for i in range(1, 11)],
+})
+COIN_ANIMATIONS = load_animations("Coin", {
+    "spin": [f"coins/gold_{i}" for i in range(1, 11)],
+}, mirrored=False)
+
 
 class AnimatedSprite:
     """Base class for animated sprites with movement and basic physics.
 
-    Handles rectangular collision bounds, velocity, gravity, and simple
-    frame-based animation timing.
+    Handles rectangular collision bounds, velocity, platform collisions, and
+    simple frame-based animation timing. Velocity and the on_ground flag live
+    in the shared body arrays (see apply_gravity()); vx, vy and on_ground are
+    views onto this sprite's row.
     """
 
     def __init__(self, x, y, width, height):
+        self.body = add_body()  # Row of this sprite in the body arrays.
+
         # The collision and position rectangle for the sprite.
         self.rect = Rect(x, y, width, height)
         self.vx = 0  # Horizontal velocity.
@@ -39,6 +151,40 @@ class AnimatedSprite:
         self.animation_speed = 0.15  # Time (in seconds) between animation frame changes.
         self.facing_right = True  # Direction the sprite is facing for drawing/flipping.
 
+    @property
+    def vx(self):
+        return float(body_vel[self.body, 0])
+
+    @vx.setter
+    def vx(self, value):
+        body_vel[self.body, 0] = value
+
+    @property
+    def vy(self):
+        return float(body_vel[self.body, 1])
+
+    @vy.setter
+    def vy(self, value):
+        body_vel[self.body, 1] = value
+
+    @property
+    def on_ground(self):
+        return bool(body_on_ground[self.body])
+
+    @on_ground.setter
+    def on_ground(self, value):
+        body_on_ground[self.body] = value
+
+    def reset(self, x, y):
+        """Moves the sprite to (x, y) and clears its motion and animation state."""
+        self.rect.topleft = (x, y)
+        self.vx = 0
+        self.vy = 0
+        self.on_ground = False
+        self.animation_frame = 0
+        self.animation_timer = 0
+        self.facing_right = True
+
     def update_animation(self, dt):
         """Updates the animation frame based on the elapsed time (dt)."""
         self.animation_timer += dt
@@ -47,48 +193,71 @@ class AnimatedSprite:
             # Advance to the next frame. The modulo operation happens during draw.
             self.animation_frame += 1
 
-    def apply_gravity(self):
-        """Applies gravity to the vertical velocity if the sprite is airborne."""
-        if not self.on_ground:
-            self.vy += GRAVITY
-            # Clamp the max falling speed to prevent excessive velocity (terminal velocity).
-            if self.vy > 15:
-                self.vy = 15
+    def move(self, platform_arr):
+        """Moves the sprite and checks for collisions with platforms.
 
-    def move(self, platforms):
-        """Moves the sprite and checks for collisions with platforms."""
+        Args:
+            platform_arr (numpy.ndarray): Platform bounds, one
+                [left, top, right, bottom] row per platform.
+        """
         # Horizontal movement and collision check.
         self.rect.x += self.vx
-        self.check_collision_x(platforms)
+        self.check_collision_x(platform_arr)
 
         # Vertical movement and collision check.
         self.rect.y += self.vy
-        self.check_collision_y(platforms)
+        self.check_collision_y(platform_arr)
+
+    def first_colliding_platform(self, platform_arr, start=0):
+        """Returns the index of the first platform from start on that overlaps the sprite.
+
+        The platforms are tested in one vectorized comparison (the same
+        strict overlap test as Rect.colliderect).
 
-    def check_collision_x(self, platforms):
+        Returns:
+            int: The platform's row in platform_arr, or -1 if none overlaps.
+        """
+        rows = platform_arr[start:]
+        if not len(rows):
+            return -1
+        rect = self.rect
+        overlap = ((rect.right > rows[:, 0]) & (rect.left < rows[:, 2]) &
+                   (rect.bottom > rows[:, 1]) & (rect.top < rows[:, 3]))
+        i = int(overlap.argmax())
+        return start + i if overlap[i] else -1
+
+    def check_collision_x(self, platform_arr):
         """Adjusts sprite position if a horizontal collision occurs."""
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                # Correct position based on direction of movement.
-                if self.vx > 0:
-                    self.rect.right = platform.left  # Collided moving right.
-                elif self.vx < 0:
-                    self.rect.left = platform.right  # Collided moving left.
-
-    def check_collision_y(self, platforms):
+        vx = self.vx
+        if not vx:
+            return  # Not moving horizontally, so no correction is needed.
+        # Each correction moves the rect, so the search resumes after the hit
+        # platform with the moved rect, as a colliderect() loop would.
+        i = self.first_colliding_platform(platform_arr)
+        while i >= 0:
+            # Correct position based on direction of movement.
+            if vx > 0:
+                self.rect.right = int(platform_arr[i, 0])  # Collided moving right.
+            else:
+                self.rect.left = int(platform_arr[i, 2])  # Collided moving left.
+            i = self.first_colliding_platform(platform_arr, i + 1)
+
+    def check_collision_y(self, platform_arr):
         """Adjusts position, resets vertical velocity, and sets on_ground flag."""
-        self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                # Check for collision from above (landing).
-                if self.vy > 0:
-                    self.rect.bottom = platform.top
-                    self.vy = 0
-                    self.on_ground = True
-                # Check for collision from below (head-bumping).
-                elif self.vy < 0:
-                    self.rect.top = platform.bottom
-                    self.vy = 0
+        vy = self.vy
+        on_ground = False
+        # The first hit zeroes vy, so later platforms never need a correction.
+        i = self.first_colliding_platform(platform_arr) if vy else -1
+        if i >= 0:
+            # Check for collision from above (landing).
+            if vy > 0:
+                self.rect.bottom = int(platform_arr[i, 1])
+                on_ground = True
+            # Check for collision from below (head-bumping).
+            else:
+                self.rect.top = int(platform_arr[i, 3])
+            self.vy = 0
+        self.on_ground = on_ground
 
 
 class Player(AnimatedSprite):
@@ -103,42 +272,34 @@ class Player(AnimatedSprite):
         self.alive = True
         self.invincible = False  # Flag for temporary invulnerability after taking damage.
         self.invincible_timer = 0  # Countdown timer for invincibility period.
+        # Leg shapes for the geometric drawing, moved in place each frame.
+        self.leg_rect_l = Rect(0, 0, 6, 10)
+        self.leg_rect_r = Rect(0, 0, 6, 10)
 
-        # Try to load sprites
-        self.has_sprites = False
-        self.idle_sprites = []
-        self.walk_sprites = []
-        self.jump_sprites = []
-
-        if USE_SPRITES:
-            try:
-                # Load idle animation (10 frames)
-                self.idle_sprites = []
-                for i in range(10):
-                    # NOTE: 'Actor' is globally available in Pygame Zero.
-                    actor = Actor(f"player/idle/idle__{i:03d}")
-                    self.idle_sprites.append(actor)
-
-                # Load run animation (10 frames)
-                self.walk_sprites = []
-                for i in range(10):
-                    actor = Actor(f"player/walk/run__{i:03d}")
-                    self.walk_sprites.append(actor)
-
-                # Load jump animation (10 frames)
-                self.jump_sprites = []
-                for i in range(10):
-                    actor = Actor(f"player/jump/jump__{i:03d}")
-                    self.jump_sprites.append(actor)
-
-                self.has_sprites = True
-                print("Player sprites loaded successfully!")
-            except Exception as e:
-                print(f"Player sprites not found: {e}")
-                print("Using geometric shapes instead")
-
-    def update(self, dt, platforms):
-        """Updates the player's physics, state, and animation."""
+        # Share the animations loaded at startup (geometric shapes if unavailable).
+        self.has_sprites = PLAYER_ANIMATIONS is not None
+
+        if self.has_sprites:
+            # Right- and left-facing frames for the idle, run and jump animations.
+            self.idle_frames_r, self.idle_frames_l = PLAYER_ANIMATIONS["idle"]
+            self.walk_frames_r, self.walk_frames_l = PLAYER_ANIMATIONS["walk"]
+            self.jump_frames_r, self.jump_frames_l = PLAYER_ANIMATIONS["jump"]
+            self.num_idle = len(self.idle_frames_r)
+            self.num_walk = len(self.walk_frames_r)
+            self.num_jump = len(self.jump_frames_r)
+
+    def reset(self, x, y):
+        """Returns the player to (x, y) with full health, keeping loaded sprites."""
+        super().reset(x, y)
+        self.jump_requested = False
+        self.move_left = False
+        self.move_right = False
+        self.alive = True
+        self.invincible = False
+        self.invincible_timer = 0
+
+    def update(self, dt):
+        """Updates the player's input-driven state ahead of the physics step."""
         if not self.alive:
             return  # Stop updating if the player has died.
 
@@ -149,28 +310,27 @@ class Player(AnimatedSprite):
                 self.invincible = False
 
         # Handle horizontal input and set velocity/facing direction.
-        self.vx = 0
+        vx = 0
         if self.move_left:
-            self.vx = -4
+            vx = -4
             self.facing_right = False
         if self.move_right:
-            self.vx = 4
+            vx = 4
             self.facing_right = True
+        self.vx = vx
 
         # Execute jump if requested and on the ground.
         if self.jump_requested and self.on_ground:
             self.vy = JUMP_STRENGTH
-            # Play jump sound only if enabled.
-            if sounds_enabled:
-                try:
-                    sounds.jump.play()
-                except:
-                    pass
+            # Play jump sound only if enabled (and available).
+            if sounds_enabled and jump_sound:
+                jump_sound.play()
             self.jump_requested = False
 
-        # Physics application (Gravity and Movement/Collision)
-        self.apply_gravity()
-        self.move(platforms)
+    def after_move(self, dt):
+        """Updates the player's animation and fall check once it has moved."""
+        if not self.alive:
+            return
 
         # Update animation only if moving horizontally or airborne.
         if self.vx != 0 or not self.on_ground:
@@ -193,34 +353,40 @@ class Player(AnimatedSprite):
         return False
 
     def draw(self):
-        """Draws the player, handling sprite selection and invincibility flashing."""
+        """Draws the player's geometric shape, handling invincibility flashing."""
         # Invincibility flashing effect: skip drawing every other frame.
         if self.invincible and int(self.invincible_timer * 10) % 2 == 0:
             return
 
-        if self.has_sprites:
-            # Choose animation based on state
-            if not self.on_ground:
-                # Use jump animation when airborne.
-                actor = self.jump_sprites[(int(self.animation_frame) % len(self.jump_sprites))]
-            elif abs(self.vx) > 0:
-                # Use walk animation when moving horizontally.
-                actor = self.walk_sprites[(int(self.animation_frame) % len(self.walk_sprites))]
-            else:
-                # Default to idle animation.
-                actor = self.idle_sprites[(int(self.animation_frame) % len(self.idle_sprites))]
-
-            # Position the Actor (Pygame Zero's image object) based on the Rect's center.
-            actor.center = self.rect.center
+        self.draw_geometric()
 
-            # Flip the sprite horizontally if facing left.
-            actor.flip_x = not self.facing_right
+    def get_blit(self):
+        """Returns the (surface, topleft) pair for the current sprite frame.
 
-            actor.draw()
-            # ---------------------------
+        Returns:
+            tuple or None: The blit arguments, or None if the player is
+            hidden this frame by the invincibility flashing.
+        """
+        if self.invincible and int(self.invincible_timer * 10) % 2 == 0:
+            return None
 
+        af = int(self.animation_frame)
+        # Choose animation based on state, in the direction being faced.
+        if not self.on_ground:
+            # Use jump animation when airborne.
+            frames = self.jump_frames_r if self.facing_right else self.jump_frames_l
+            surf, half_w, half_h = frames[af % self.num_jump]
+        elif abs(self.vx) > 0:
+            # Use walk animation when moving horizontally.
+            frames = self.walk_frames_r if self.facing_right else self.walk_frames_l
+            surf, half_w, half_h = frames[af % self.num_walk]
         else:
-            self.draw_geometric()
+            # Default to idle animation.
+            frames = self.idle_frames_r if self.facing_right else self.idle_frames_l
+            surf, half_w, half_h = frames[af % self.num_idle]
+
+        # Center the frame on the collision Rect.
+        return surf, (self.rect.centerx - half_w, self.rect.centery - half_h)
 
     def draw_geometric(self):
         """Draws a placeholder shape for the player when sprites are disabled."""
@@ -228,17 +394,16 @@ class Player(AnimatedSprite):
         walk_colors = [(100, 150, 255), (110, 160, 255),
                        (120, 170, 255), (110, 160, 255)]
 
+        af = int(self.animation_frame)
         if abs(self.vx) > 0:
-            frame_count = len(walk_colors)
-            color = walk_colors[int(self.animation_frame) % frame_count]
+            color = walk_colors[af % len(walk_colors)]
         else:
-            frame_count = len(idle_colors)
-            color = idle_colors[int(self.animation_frame) % frame_count]
+            color = idle_colors[af % len(idle_colors)]
 
         screen.draw.filled_rect(self.rect, color)
 
         eye_y = self.rect.y + 15
-        if int(self.animation_frame) % 20 == 0:
+        if af % 20 == 0:
             screen.draw.line((self.rect.x + 12, eye_y),
                            (self.rect.x + 18, eye_y), (0, 0, 0))
             screen.draw.line((self.rect.x + 22, eye_y),
@@ -247,22 +412,15 @@ class Player(AnimatedSprite):
             screen.draw.filled_circle((self.rect.x + 15, eye_y), 3, (0, 0, 0))
             screen.draw.filled_circle((self.rect.x + 25, eye_y), 3, (0, 0, 0))
 
-        leg_width = 6
+        # Legs swing in opposite directions while walking.
         if abs(self.vx) > 0:
-            leg_offset = int(math.sin(self.animation_frame * 3) * 5)
-            screen.draw.filled_rect(
-                Rect(self.rect.x + 10, self.rect.bottom - 10 + leg_offset,
-                     leg_width, 10), (50, 100, 200))
-            screen.draw.filled_rect(
-                Rect(self.rect.x + 24, self.rect.bottom - 10 - leg_offset,
-                     leg_width, 10), (50, 100, 200))
+            leg_offset = int(SIN_LUT[int(af * 3 * SIN_LUT_SCALE + 0.5) & SIN_LUT_MASK] * 5)
         else:
-            screen.draw.filled_rect(
-                Rect(self.rect.x + 10, self.rect.bottom - 10, leg_width, 10),
-                (50, 100, 200))
-            screen.draw.filled_rect(
-                Rect(self.rect.x + 24, self.rect.bottom - 10, leg_width, 10),
-                (50, 100, 200))
+            leg_offset = 0
+        self.leg_rect_l.topleft = (self.rect.x + 10, self.rect.bottom - 10 + leg_offset)
+        self.leg_rect_r.topleft = (self.rect.x + 24, self.rect.bottom - 10 - leg_offset)
+        screen.draw.filled_rect(self.leg_rect_l, (50, 100, 200))
+        screen.draw.filled_rect(self.leg_rect_r, (50, 100, 200))
 
 
 class Enemy(AnimatedSprite):
@@ -275,25 +433,25 @@ class Enemy(AnimatedSprite):
         self.patrol_right = patrol_right  # The maximum X coordinate for patrolling (right boundary).
         self.speed = 2
         self.vx = self.speed  # Start moving right.
+        # Spike shapes for the geometric drawing, moved in place each frame.
+        self.spike_rects = [Rect(0, 0, 8, 8) for _ in range(3)]
 
-        # Try to load sprites
-        self.has_sprites = False
-        self.sprites = []
-
-        if USE_SPRITES:
-            try:
-                self.sprites = []
-                for i in range(1, 11):
-                    actor = Actor(f"enemies/walk_{i}")
-                    self.sprites.append(actor)
-                self.has_sprites = True
-                print("Enemy sprites loaded successfully!")
-            except Exception as e:
-                print(f"Enemy sprites not found: {e}")
-                print("Using geometric shapes instead")
-
-    def update(self, dt, platforms):
-        """Updates the enemy's movement logic, physics, and animation."""
+        # Share the animation loaded at startup (geometric shapes if unavailable).
+        self.has_sprites = ENEMY_ANIMATIONS is not None
+
+        if self.has_sprites:
+            self.frames_r, self.frames_l = ENEMY_ANIMATIONS["walk"]
+            self.num_frames = len(self.frames_r)
+
+    def reset(self, x, y, patrol_left, patrol_right):
+        """Respawns the enemy at (x, y) with a new patrol range, keeping loaded sprites."""
+        super().reset(x, y)
+        self.patrol_left = patrol_left
+        self.patrol_right = patrol_right
+        self.vx = self.speed  # Start moving right.
+
+    def update(self, dt):
+        """Updates the enemy's patrol logic and animation ahead of the physics step."""
         # Check and reverse direction at the patrol boundaries.
         if self.rect.left <= self.patrol_left:
             self.vx = self.speed
@@ -302,43 +460,37 @@ class Enemy(AnimatedSprite):
             self.vx = -self.speed
             self.facing_right = False
 
-        self.apply_gravity()
-        self.move(platforms)
-        self.update_animation(dt)
+        # Off-screen enemies keep patrolling but don't animate.
+        if CULL_RECT.colliderect(self.rect):
+            self.update_animation(dt)
 
     def draw(self):
-        """Draws the enemy, handling sprite selection and flipping."""
-        if self.has_sprites:
-            # Select the current animation frame using modulo.
-            actor = self.sprites[int(self.animation_frame) % len(self.sprites)]
+        """Draws the enemy's geometric shape (sprite frames go through get_blit())."""
+        self.draw_geometric()
 
-            actor.center = self.rect.center
-
-            # Flip the sprite based on current horizontal direction.
-            actor.flip_x = not self.facing_right
-
-            actor.draw()
-            # ---------------------------
-        else:
-            self.draw_geometric()
+    def get_blit(self):
+        """Returns the (surface, topleft) pair for the current sprite frame."""
+        # Select the frame list for the current direction, then the frame by modulo.
+        frames = self.frames_r if self.facing_right else self.frames_l
+        surf, half_w, half_h = frames[int(self.animation_frame) % self.num_frames]
+        return surf, (self.rect.centerx - half_w, self.rect.centery - half_h)
 
     def draw_geometric(self):
         """Draws a placeholder shape for the enemy when sprites are disabled."""
         body_colors = [(255, 100, 100), (255, 120, 120), (255, 110, 110)]
-        frame_count = len(body_colors)
-        color = body_colors[int(self.animation_frame) % frame_count]
+        color = body_colors[int(self.animation_frame) % len(body_colors)]
 
         screen.draw.filled_rect(self.rect, color)
 
-        spike_offset = int(math.sin(self.animation_frame * 2) * 3)
-        spike_positions = [self.rect.x + 5, self.rect.x + 15, self.rect.x + 25]
-        spike_size = 8
-        for spike_x in spike_positions:
-            spike_rect = Rect(spike_x, self.rect.y + spike_offset - 5,
-                            spike_size, spike_size)
+        # Each phase is scaled from the angle first, then rounded to a table step.
+        angle = self.animation_frame * SIN_LUT_SCALE
+        spike_offset = int(SIN_LUT[int(angle * 2 + 0.5) & SIN_LUT_MASK] * 3)
+        spike_y = self.rect.y + spike_offset - 5
+        for spike_rect, spike_dx in zip(self.spike_rects, (5, 15, 25)):
+            spike_rect.topleft = (self.rect.x + spike_dx, spike_y)
             screen.draw.filled_rect(spike_rect, (150, 50, 50))
 
-        eye_x_offset = int(math.sin(self.animation_frame) * 2)
+        eye_x_offset = int(SIN_LUT[int(angle + 0.5) & SIN_LUT_MASK] * 2)
         screen.draw.filled_circle(
             (self.rect.x + 10 + eye_x_offset, self.rect.y + 20),
             2, (255, 255, 0))
@@ -347,7 +499,7 @@ class Enemy(AnimatedSprite):
             2, (255, 255, 0))
 
         mouth_y = self.rect.y + 28
-        mouth_width = int(abs(math.sin(self.animation_frame * 1.5)) * 10) + 5
+        mouth_width = int(abs(SIN_LUT[int(angle * 1.5 + 0.5) & SIN_LUT_MASK]) * 10) + 5
         screen.draw.line((self.rect.centerx - mouth_width//2, mouth_y),
                         (self.rect.centerx + mouth_width//2, mouth_y),
                         (100, 0, 0))
@@ -360,73 +512,49 @@ class Coin:
         self.x = x
         self.y = y
         self.radius = 12
-        self.collected = False  # State of the coin.
         self.animation_frame = 0  # Counter for the coin's spinning animation.
+        self.inner_rect = Rect(0, 0, 0, 0)  # Geometric drawing's face, resized in place.
+
+        # Share the animation loaded at startup (geometric shapes if unavailable).
+        self.has_sprites = COIN_ANIMATIONS is not None
 
-        # Try to load sprites
-        self.has_sprites = False
-        self.sprites = []
-
-        if USE_SPRITES:
-            try:
-                self.sprites = []
-                for i in range(1, 11):
-                    actor = Actor(f"coins/gold_{i}")
-                    self.sprites.append(actor)
-                self.has_sprites = True
-                print("Coin sprites loaded successfully!")
-            except Exception as e:
-                print(f"Coin sprites not found: {e}")
-                print("Using geometric shapes instead")
+        if self.has_sprites:
+            self.frames = COIN_ANIMATIONS["spin"][0]
+            self.num_frames = len(self.frames)
+
+    def reset(self, x, y):
+        """Places the coin back at (x, y), keeping loaded sprites."""
+        self.x = x
+        self.y = y
+        self.animation_frame = 0
 
     def update(self, dt):
         """Updates the coin's animation frame."""
         # Increase frame counter faster (dt * 5) for a quicker animation cycle.
         self.animation_frame += dt * 5
 
-    def check_collision(self, player):
-        """Checks for collision with the player using distance (circular collision).
-
-        Returns:
-            bool: True if the coin was collected, False otherwise.
-        """
-        if self.collected:
-            return False
-        # Calculate distance between coin center and player center.
-        dist = math.sqrt((self.x - player.rect.centerx)**2 +
-                        (self.y - player.rect.centery)**2)
-        # Check if centers are closer than the sum of radii/approximate hitboxes.
-        if dist < self.radius + 20:
-            self.collected = True
-            return True
-        return False
-
     def draw(self):
-        """Draws the coin if it hasn't been collected."""
-        if self.collected:
-            return
+        """Draws the coin's geometric shape (sprite frames go through get_blit())."""
+        self.draw_geometric()
 
-        if self.has_sprites:
-            # Select the current animation frame using modulo.
-            actor = self.sprites[int(self.animation_frame) % len(self.sprites)]
-
-            actor.center = (self.x, self.y)
-
-            actor.draw()
-        else:
-            self.draw_geometric()
+    def get_blit(self):
+        """Returns the (surface, topleft) pair for the current sprite frame."""
+        # Select the current animation frame using modulo.
+        surf, half_w, half_h = self.frames[int(self.animation_frame) % self.num_frames]
+        return surf, (self.x - half_w, self.y - half_h)
 
     def draw_geometric(self):
         """Draws a simple 3D-spinning effect using scaling/width change."""
-        scale = abs(math.cos(self.animation_frame))
+        index = int(self.animation_frame * SIN_LUT_SCALE + 0.5) + SIN_LUT_SIZE // 4
+        scale = abs(SIN_LUT[index & SIN_LUT_MASK])  # |cos(animation_frame)|
         width = int(self.radius * 2 * scale)
         if width < 2:
             width = 2
 
         screen.draw.filled_circle((self.x, self.y), self.radius, (255, 215, 0))
-        inner_rect = Rect(self.x - width//2, self.y - self.radius,
-                         width, self.radius * 2)
-        screen.draw.filled_rect(inner_rect, (255, 255, 100))
+        self.inner_rect.update(self.x - width//2, self.y - self.radius,
+                               width, self.radius * 2)
+        screen.draw.filled_rect(self.inner_rect, (255, 255, 100))
 
 
 class Button:
@@ -436,6 +564,18 @@ class Button:
         self.rect = Rect(x, y, width, height)
         self.text = text
         self.hovered = False  # State used to change color when the mouse is over it.
+        # The button never changes shape or label, so both looks are pre-rendered.
+        self.surf_idle = self.render((80, 180, 80))
+        self.surf_hover = self.render((100, 200, 100))
+
+    def render(self, color):
+        """Renders the button face (fill, outline and centered label) to a Surface."""
+        surf = pygame.Surface(self.rect.size)
+        surf.fill(color)
+        pygame.draw.rect(surf, (255, 255, 255), surf.get_rect(), 1)
+        label = fonts[30].render(self.text, True, (255, 255, 255))
+        surf.blit(label, label.get_rect(center=surf.get_rect().center))
+        return surf
 
     def update(self, mouse_pos):
         """Checks if the mouse is hovering over the button."""
@@ -446,21 +586,102 @@ class Button:
         return self.rect.collidepoint(mouse_pos)
 
     def draw(self):
-        """Draws the button with hover effect and centered text."""
-        color = (100, 200, 100) if self.hovered else (80, 180, 80)
-        screen.draw.filled_rect(self.rect, color)
-        screen.draw.rect(self.rect, (255, 255, 255))
-        screen.draw.text(self.text, center=(self.rect.centerx, self.rect.centery),
-                        fontsize=30, color=(255, 255, 255))
+        """Draws the pre-rendered button face for the current hover state."""
+        screen.surface.blit(self.surf_hover if self.hovered else self.surf_idle,
+                            self.rect.topleft)
+
+
+def make_heart_surface():
+    """Pre-renders the heart icon used by the lives HUD.
+
+    The shape is drawn once with its top-left circle centered at (10, 10),
+    so it is blitted at (heart_x - 10, heart_y - 10).
+    """
+    surf = pygame.Surface((32, 32), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (255, 0, 0), (10, 10), 8)
+    pygame.draw.circle(surf, (255, 0, 0), (20, 10), 8)
+    pygame.draw.circle(surf, (255, 0, 0), (15, 20), 10)
+    return surf
+
+
+heart_surface = make_heart_surface()
+# Blit arguments for the lives HUD, one heart per life at (20 + i * 35, 100);
+# draw() slices this to the current number of lives.
+heart_blits = [(heart_surface, (20 + i * 35 - 10, 100 - 10)) for i in range(MAX_LIVES)]
+
+# Fonts for HUD and menu text, created once (the same default font that
+# screen.draw.text uses).
+fonts = {size: pygame.font.Font(None, size) for size in (25, 30, 50, 60)}
+text_cache = {}  # Maps a HUD/menu slot to its (text, rendered Surface).
+
+
+def get_text_surf(key, text, size, color):
+    """Returns the rendered Surface for a text slot, re-rendering on change.
 
+    Args:
+        key (str): Identifies the on-screen slot (e.g. "score").
+        text (str): The text currently shown in that slot.
+        size (int): Font size; must be one of the pre-created fonts.
+        color (tuple): RGB text color.
+    """
+    cached = text_cache.get(key)
+    if cached is None or cached[0] != text:
+        cached = (text, fonts[size].render(text, True, color))
+        text_cache[key] = cached
+    return cached[1]
+
+
+def draw_text(key, text, size, color, **pos):
+    """Blits a cached text Surface, positioned like Rect keywords (topleft=, center=).
+
+    Returns:
+        Rect: The screen area drawn.
+    """
+    surf = get_text_surf(key, text, size, color)
+    return screen.surface.blit(surf, surf.get_rect(**pos))
+
+
+def load_sound(name):
+    """Looks up a sound effect once, returning None if it can't be loaded."""
+    try:
+        return getattr(sounds, name)
+    except Exception as e:
+        print(f"Sound '{name}' not found: {e}")
+        return None
+
+
+# Sound effects, resolved once so the game loop doesn't repeat the lookup.
+jump_sound = load_sound("jump")
+coin_sound = load_sound("coin")
+hit_sound = load_sound("hit")
 
 # Game objects
 player = Player(100, 400)
 enemies = []
+enemy_rects = []  # The enemies' Rects (updated in place as they move), for collidelist().
 coins = []
+active_coins = []  # Coins not yet collected; shrinks as the player picks them up.
+# Coin centers and collected flags, indexed like coins, so every coin is
+# tested against the player in one vectorized pass.
+coin_xs = np.zeros(0, dtype=np.float32)
+coin_ys = np.zeros(0, dtype=np.float32)
+collected_mask = np.zeros(0, dtype=bool)
 platforms = []
+# Platform bounds as a (len(platforms), 4) array of [left, top, right, bottom].
+platform_arr = np.zeros((0, 4), dtype=np.int32)
+level_background = None  # Sky and platforms pre-rendered once per level.
+# Dirty-rectangle drawing: the screen keeps its contents between frames, so the
+# level is only fully repainted when the game state (or level) changes. After
+# that, each frame restores level_background under the areas drawn the frame
+# before and draws on top. Geometric shapes aren't tracked, so without sprite
+# images every frame is a full repaint. Together, prev_rects and dirty_rects
+# are the areas a pygame.display.update(prev_rects + dirty_rects) call would
+# need to present the frame.
+prev_rects = []  # Screen areas restored this frame (the whole screen on a repaint).
+dirty_rects = []  # Screen areas drawn this frame; restored at the start of the next.
+drawn_state = None  # Game state of the last frame drawn (None forces a repaint).
+track_dirty_rects = None not in (PLAYER_ANIMATIONS, ENEMY_ANIMATIONS, COIN_ANIMATIONS)
 buttons = []
-mouse_pos = (0, 0)
 
 # Create menu buttons
 buttons.append(Button(300, 200, 200, 50, "Start Game"))
@@ -469,16 +690,21 @@ buttons.append(Button(300, 360, 200, 50, "Toggle Sounds"))
 buttons.append(Button(300, 440, 200, 50, "Exit"))
 
 
+# Level layout: enemy spawns as (x, y, patrol_left, patrol_right), coins as (x, y).
+ENEMY_SPAWNS = [(160, 400, 150, 330), (460, 350, 450, 630), (510, 200, 500, 660)]
+COIN_SPAWNS = [(250, 420), (550, 370), (275, 270), (590, 220), (375, 150), (700, 500)]
+
+
 def init_level():
     """Initializes/resets all game objects and state variables for a new level."""
-    global player, enemies, coins, platforms, score, game_over_message, lives
+    global platform_arr, level_background, drawn_state
+    global coin_xs, coin_ys, collected_mask
+    global score, game_over_message, lives
 
-    player = Player(100, 400)  # Recreate player at starting position.
-    enemies.clear()  # Clear all lists of game objects.
-    coins.clear()
+    player.reset(100, 400)  # Return the player to the starting position.
     platforms.clear()
     score = 0
-    lives = 3
+    lives = MAX_LIVES
     game_over_message = ""
 
     # Define platform geometry.
@@ -488,17 +714,33 @@ def init_level():
     platforms.append(Rect(200, 300, 150, 20))
     platforms.append(Rect(500, 250, 180, 20))
     platforms.append(Rect(300, 175, 150, 20))
-
-    enemies.append(Enemy(160, 400, 150, 330))
-    enemies.append(Enemy(460, 350, 450, 630))
-    enemies.append(Enemy(510, 200, 500, 660))
-
-    coins.append(Coin(250, 420))
-    coins.append(Coin(550, 370))
-    coins.append(Coin(275, 270))
-    coins.append(Coin(590, 220))
-    coins.append(Coin(375, 150))
-    coins.append(Coin(700, 500))
+    platform_arr = np.array([[p.left, p.top, p.right, p.bottom] for p in platforms],
+                            dtype=np.int32)
+
+    # Platforms are static, so render them with the sky into a single
+    # Surface that draw() blits each frame.
+    level_background = pygame.Surface((WIDTH, HEIGHT))
+    level_background.fill((135, 206, 235))
+    for platform in platforms:
+        pygame.draw.rect(level_background, (100, 200, 100), platform)
+        pygame.draw.rect(level_background, (80, 180, 80), platform, 1)
+    drawn_state = None  # New background: repaint the whole screen next frame.
+
+    # Enemies and coins are created on the first level start, then reset
+    # (not rebuilt) on later ones so their sprites are only loaded once.
+    if not enemies:
+        enemies.extend(Enemy(*spawn) for spawn in ENEMY_SPAWNS)
+        enemy_rects.extend(enemy.rect for enemy in enemies)
+        coins.extend(Coin(*spawn) for spawn in COIN_SPAWNS)
+    else:
+        for enemy, spawn in zip(enemies, ENEMY_SPAWNS):
+            enemy.reset(*spawn)
+        for coin, spawn in zip(coins, COIN_SPAWNS):
+            coin.reset(*spawn)
+    active_coins[:] = coins
+    coin_xs = np.array([coin.x for coin in coins], dtype=np.float32)
+    coin_ys = np.array([coin.y for coin in coins], dtype=np.float32)
+    collected_mask = np.zeros(len(coins), dtype=bool)
 
 
 def update(dt):
@@ -519,57 +761,75 @@ def update(dt):
         except:
             pass
 
+    # Bind frequently used globals to locals for the per-frame work below.
+    kb = keyboard
+    plr = player
+
     if game_state == "playing":
         # Map keyboard inputs to player movement flags (allows for diagonal movement).
-        player.move_left = keyboard.left or keyboard.a
-        player.move_right = keyboard.right or keyboard.d
+        plr.move_left = kb.left or kb.a
+        plr.move_right = kb.right or kb.d
 
     if game_state == "menu":
-        # Update button hover states in the menu.
+        # Update button hover states in the menu; the mouse is only polled here,
+        # so gameplay does no work for mouse motion.
+        mouse_pos = pygame.mouse.get_pos()
         for button in buttons:
             button.update(mouse_pos)
 
     elif game_state == "playing":
-        player.update(dt, platforms)
-
-        # Update enemy movement and coin animation/collision.
+        # Input and AI first, then one gravity step for every body, then each
+        # sprite moves and resolves its own platform collisions.
+        plr.update(dt)
         for enemy in enemies:
-            enemy.update(dt, platforms)
+            enemy.update(dt)
 
-        for coin in coins:
-            coin.update(dt)
-            if coin.check_collision(player):
+        apply_gravity()
+        if plr.alive:
+            plr.move(platform_arr)
+        for enemy in enemies:
+            enemy.move(platform_arr)
+        plr.after_move(dt)
+
+        # Animate the uncollected coins that are on-screen.
+        for coin in active_coins:
+            if CULL_RECT.collidepoint(coin.x, coin.y):
+                coin.update(dt)
+
+        # Test every coin against the player at once: a coin is collected when
+        # the centers are closer than the pickup distance (compared squared).
+        dx = coin_xs - plr.rect.centerx
+        dy = coin_ys - plr.rect.centery
+        hits = (dx * dx + dy * dy < COIN_PICKUP_DIST_SQ) & ~collected_mask
+        if hits.any():
+            collected_mask[hits] = True
+            for idx in np.flatnonzero(hits):
+                active_coins.remove(coins[idx])
                 score += 10
-                if sounds_enabled:
-                    try:
-                        sounds.coin.play()
-                    except:
-                        pass
+                if sounds_enabled and coin_sound:
+                    coin_sound.play()
 
         # Check for player-enemy collision only if the player is alive.
-        if player.alive:
-            for enemy in enemies:
-                if player.rect.colliderect(enemy.rect):
-                    # Attempt to apply damage and check if it was successful (not invincible).
-                    if player.take_damage():
-                        lives -= 1
-                        if sounds_enabled:
-                            try:
-                                sounds.hit.play()
-                            except:
-                                pass
-                        # Check for game over after losing a life.
-                        if lives <= 0:
-                            player.alive = False
-                            game_over_message = "Game Over! No lives left!"
+        # All enemies are tested in a single collidelist() call; a hit grants
+        # invincibility, so only the first touching enemy matters.
+        if plr.alive and plr.rect.collidelist(enemy_rects) >= 0:
+            # Attempt to apply damage and check if it was successful (not invincible).
+            if plr.take_damage():
+                lives -= 1
+                if sounds_enabled and hit_sound:
+                    hit_sound.play()
+                # Check for game over after losing a life.
+                if lives <= 0:
+                    plr.alive = False
+                    game_over_message = "Game Over! No lives left!"
 
         # Win condition: all coins collected and player is alive.
-        if all(coin.collected for coin in coins) and player.alive:
+        if not active_coins and plr.alive:
             game_state = "win"
             game_over_message = f"You Won! Score: {score}"
 
         # Transition to game over state if the player dies from falling or running out of lives.
-        if not player.alive:
+        if not plr.alive:
             game_state = "gameover"
 
 
@@ -578,57 +838,70 @@ def draw():
 
     Renders the scene based on the current game state.
     """
-    screen.clear()
+    global drawn_state
 
     if game_state == "menu":
         screen.fill((30, 30, 60))
-        screen.draw.text("SUPER NINJA MARIO SONIC COPY", center=(400, 100),
-                        fontsize=60, color=(255, 255, 255))
-        screen.draw.text(f"Music: {'ON' if music_enabled else 'OFF'}  "
-                        f"Sounds: {'ON' if sounds_enabled else 'OFF'}",
-                        center=(400, 520), fontsize=25, color=(200, 200, 200))
+        draw_text("title", "SUPER NINJA MARIO SONIC COPY", 60, (255, 255, 255),
+                  center=(400, 100))
+        draw_text("audio", f"Music: {'ON' if music_enabled else 'OFF'}  "
+                  f"Sounds: {'ON' if sounds_enabled else 'OFF'}",
+                  25, (200, 200, 200), center=(400, 520))
 
         for button in buttons:
             button.draw()
 
     elif game_state in ["playing", "gameover", "win"]:
-        screen.fill((135, 206, 235))
-
-        for platform in platforms:
-            # Simple platform rendering.
-            screen.draw.filled_rect(platform, (100, 200, 100))
-            screen.draw.rect(platform, (80, 180, 80))
-
-        # Draw objects in layer order (coins, then enemies, then player).
-        for coin in coins:
-            coin.draw()
-
-        for enemy in enemies:
-            enemy.draw()
-
+        # Sky and platforms, pre-rendered in init_level(): the whole screen
+        # after a state change, otherwise just under last frame's drawing.
+        if drawn_state != game_state or not track_dirty_rects:
+            prev_rects[:] = [screen.surface.blit(level_background, (0, 0))]
+        else:
+            screen.surface.blits([(level_background, rect, rect) for rect in dirty_rects],
+                                 False)
+            prev_rects[:] = dirty_rects
+        dirty_rects.clear()
+
+        # Draw objects in layer order (coins, then enemies, then player),
+        # skipping any that are off-screen. Sprite frames are collected and sent
+        # to the screen in batched blits; entities without sprites draw their
+        # geometric shapes directly, after flushing the frames queued beneath
+        # them so the layer order holds.
+        layer = [coin for coin in active_coins if CULL_RECT.collidepoint(coin.x, coin.y)]
+        layer.extend(enemy for enemy in enemies if CULL_RECT.colliderect(enemy.rect))
         if player.alive:
-            player.draw()
+            layer.append(player)
+
+        sprite_blits = []
+        for sprite in layer:
+            if sprite.has_sprites:
+                blit = sprite.get_blit()
+                if blit is not None:
+                    sprite_blits.append(blit)
+            else:
+                if sprite_blits:
+                    dirty_rects.extend(screen.surface.blits(sprite_blits))
+                    sprite_blits.clear()
+                sprite.draw()
+        dirty_rects.extend(screen.surface.blits(sprite_blits))
 
         # Draw HUD elements (Score, Coin count).
-        screen.draw.text(f"Score: {score}", (20, 20), fontsize=30, color=(255, 255, 255))
-        screen.draw.text(f"Coins: {sum(1 for c in coins if not c.collected)}/{len(coins)}",
-                        (20, 60), fontsize=30, color=(255, 255, 255))
-
-        # Draw 'lives' as small hearts.
-        for i in range(lives):
-            heart_x = 20 + i * 35
-            heart_y = 100
-            # Simple heart shape drawing.
-            screen.draw.filled_circle((heart_x, heart_y), 8, (255, 0, 0))
-            screen.draw.filled_circle((heart_x + 10, heart_y), 8, (255, 0, 0))
-            screen.draw.filled_circle((heart_x + 5, heart_y + 10), 10, (255, 0, 0))
+        dirty_rects.append(draw_text("score", f"Score: {score}", 30, (255, 255, 255),
+                                     topleft=(20, 20)))
+        dirty_rects.append(draw_text("coins", f"Coins: {len(active_coins)}/{len(coins)}",
+                                     30, (255, 255, 255), topleft=(20, 60)))
+
+        # Draw 'lives' as small hearts using the pre-rendered heart icon.
+        dirty_rects.extend(screen.surface.blits(heart_blits[:lives]))
 
         # Draw game over/win message overlay.
         if game_state in ["gameover", "win"]:
-            screen.draw.text(game_over_message, center=(400, 250),
-                           fontsize=50, color=(255, 255, 0))
-            screen.draw.text("Press SPACE to return to menu", center=(400, 320),
-                           fontsize=30, color=(255, 255, 255))
+            dirty_rects.append(draw_text("message", game_over_message, 50, (255, 255, 0),
+                                         center=(400, 250)))
+            dirty_rects.append(draw_text("prompt", "Press SPACE to return to menu", 30,
+                                         (255, 255, 255), center=(400, 320)))
+
+    drawn_state = game_state
 
 
 def on_key_down(key):
@@ -681,11 +954,5 @@ def on_mouse_down(pos):
                     exit()
 
 
-def on_mouse_move(pos):
-    """Updates the global mouse position for use in button hover checks."""
-    global mouse_pos
-    mouse_pos = pos
-
-
 # Start the Pygame Zero application.
 pgzrun.go()
\ No newline at end of file